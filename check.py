@@ -1,34 +1,43 @@
 import sys
 import re
 
+DOT_CHARS = ('●', '○')
+OPEN_CHARS = frozenset(' ●○')
+
+GRID_HEADER = "Puzzle Grid ("
+SIZE_RE = re.compile(r"Puzzle Grid \((\d+)x(\d+)\):")
+NO_SOLUTION = "No solution found"
+# The solvers print the marker as their only output, so only the head is searched
+NO_SOLUTION_SCAN = 200
+
 def parse_output(output_text):
-    lines = output_text.strip().split('\n')
-    
-    # Find the grid
-    size_match = re.search(r"Puzzle Grid \((\d+)x(\d+)\):", output_text)
+    # Find the grid header without splitting the (possibly long) log into lines
+    start = output_text.find(GRID_HEADER)
+    size_match = SIZE_RE.match(output_text, start) if start != -1 else None
     if not size_match:
         return None, "Could not find puzzle dimensions"
     
     w = int(size_match.group(1))
     h = int(size_match.group(2))
     
-    start_idx = -1
-    for i, line in enumerate(lines):
-        if line.startswith("Puzzle Grid"):
-            start_idx = i + 2 # Skip title and top border
-            break
-            
-    if start_idx == -1:
-        return None, "Could not find grid start"
+    # Skip the rest of the title line and the top border
+    pos = size_match.end()
+    for _ in range(2):
+        pos = output_text.find('\n', pos) + 1
+        if pos == 0:
+            return None, "Output truncated"
 
+    # Read exactly the grid rows
     sy = 2 * h + 1
-    if start_idx + sy > len(lines):
-        return None, "Output truncated"
-        
-    grid_rows = lines[start_idx : start_idx + sy]
-    
-    if len(grid_rows) != sy:
-        return None, f"Expected {sy} grid rows, found {len(grid_rows)}"
+    grid_rows = []
+    for _ in range(sy):
+        if pos >= len(output_text):
+            return None, "Output truncated"
+        end = output_text.find('\n', pos)
+        if end == -1:
+            end = len(output_text)
+        grid_rows.append(output_text[pos:end])
+        pos = end + 1
         
     return {
         'w': w,
@@ -42,122 +51,128 @@ def validate_solution(data):
     rows = data['rows']
     
     dots = []
-    adj = {} # (tx, ty) -> list of (ntx, nty)
     
-    # Initialize all tiles
-    tiles = []
-    for ty in range(h):
-        for tx in range(w):
-            tiles.append((tx, ty))
-            adj[(tx, ty)] = []
+    # Tiles are numbered row-major: tile (tx, ty) is ty * w + tx
+    n = w * h
+    adj = [set() for _ in range(n)] # tile -> set of neighbor tiles
 
     # Parse dots and connections
-    for y in range(len(rows)):
-        line = rows[y]
-        # Pad line if short
-        if len(line) < 2 * w + 1:
-            line = line + " " * (2 * w + 1 - len(line))
-            
-        for x in range(len(line)):
-            char = line[x]
-            
-            # Check for dots
-            if char in ['●', '○']:
+    row_len = 2 * w + 1
+    rows = [line.ljust(row_len) for line in rows]
+    
+    for y, line in enumerate(rows):
+        for char in DOT_CHARS:
+            x = line.find(char)
+            while x != -1:
                 dots.append({'x': x, 'y': y, 'color': char})
-            
-            # Check connections (absence of walls)
-            # Vertical edge check (x is even, y is odd) -> connects (x/2-1, y/2) and (x/2, y/2)
-            if x % 2 == 0 and y % 2 == 1:
-                if char == ' ' or char in ['●', '○']: # No wall (dots can be on edges)
-                    tx1 = (x // 2) - 1
-                    tx2 = x // 2
-                    ty = (y - 1) // 2
-                    if 0 <= tx1 < w and 0 <= tx2 < w:
-                        adj[(tx1, ty)].append((tx2, ty))
-                        adj[(tx2, ty)].append((tx1, ty))
-            
-            # Horizontal edge check (x is odd, y is even) -> connects (x/2, y/2-1) and (x/2, y/2)
-            if x % 2 == 1 and y % 2 == 0:
-                if char == ' ' or char in ['●', '○']: # No wall
-                    tx = (x - 1) // 2
-                    ty1 = (y // 2) - 1
-                    ty2 = y // 2
-                    if 0 <= ty1 < h and 0 <= ty2 < h:
-                        adj[(tx, ty1)].append((tx, ty2))
-                        adj[(tx, ty2)].append((tx, ty1))
+                x = line.find(char, x + 1)
+
+    # Connections are the edges without a wall (dots can be on edges).
+    # h_adj[ty][tx]: (tx, ty) - (tx+1, ty), read from the even columns of tile row ty
+    # v_adj[ty][tx]: (tx, ty) - (tx, ty+1), read from the odd columns of edge row ty+1
+    h_adj = [[char in OPEN_CHARS for char in rows[2 * ty + 1][2:row_len - 1:2]] for ty in range(h)]
+    v_adj = [[char in OPEN_CHARS for char in rows[2 * ty + 2][1:row_len:2]] for ty in range(h - 1)]
+    
+    for ty, open_row in enumerate(h_adj):
+        base = ty * w
+        for tx, is_open in enumerate(open_row):
+            if is_open:
+                adj[base + tx].add(base + tx + 1)
+                adj[base + tx + 1].add(base + tx)
+                
+    for ty, open_row in enumerate(v_adj):
+        base = ty * w
+        for tx, is_open in enumerate(open_row):
+            if is_open:
+                adj[base + tx].add(base + tx + w)
+                adj[base + tx + w].add(base + tx)
 
     # 2. Find Connected Components (Regions)
-    visited = set()
+    # Grow each region a whole frontier at a time with C-level set union/difference.
+    # visited is a byte per tile, so the next unlabeled tile is a single find().
+    visited = bytearray(n)
+    adj_get = adj.__getitem__
     regions = []
     
-    for tile in tiles:
-        if tile not in visited:
-            # BFS
-            region = []
-            q = [tile]
-            visited.add(tile)
-            while q:
-                curr = q.pop(0)
-                region.append(curr)
-                for neighbor in adj[curr]:
-                    if neighbor not in visited:
-                        visited.add(neighbor)
-                        q.append(neighbor)
-            regions.append(region)
+    tile = visited.find(0)
+    while tile != -1:
+        region = set()
+        frontier = {tile}
+        while frontier:
+            region |= frontier
+            frontier = set().union(*map(adj_get, frontier)) - region
+        for t in region:
+            visited[t] = 1
+        regions.append(region)
+        tile = visited.find(0, tile + 1)
             
     # 3. Validate Regions
+    # Every region needs its own dot; a count mismatch fails before any symmetry work
+    if len(regions) != len(dots):
+        return False, f"Found {len(regions)} regions but {len(dots)} dots"
+    
+    # A region symmetric around a dot has that dot as its centroid, so the
+    # only candidate is the dot at (sum of tile centers) / (region size).
+    # Rotating (tx, ty) around dot (dx, dy) gives (dx - tx - 1, dy - ty - 1); its
+    # constants are fixed per puzzle, so each dot maps to
+    # (dot index, bounding box x sum, bounding box y sum, bitmask shift).
+    dot_lookup = {}
+    for i, dot in enumerate(dots):
+        dx, dy = dot['x'], dot['y']
+        dot_lookup[(dx, dy)] = (i, dx - 1, dy - 1, n - 1 - (dy - 1) * w - (dx - 1))
+    mask_fmt = f'0{n}b'
     used_dots = []
     
     for region in regions:
-        valid_dot = None
+        # Tile coordinates as separate x / y arrays
+        xs = [tile % w for tile in region]
+        ys = [tile // w for tile in region]
+        size = len(region)
+        sx = 2 * sum(xs) + size
+        sy = 2 * sum(ys) + size
         
-        # Check against all dots
-        for i, dot in enumerate(dots):
-            dx, dy = dot['x'], dot['y']
-            
-            # Check symmetry for this dot
-            is_symmetric = True
-            for tx, ty in region:
-                # Tile center in internal coords
-                cx = 2 * tx + 1
-                cy = 2 * ty + 1
-                
-                # Rotated center
-                rcx = 2 * dx - cx
-                rcy = 2 * dy - cy
-                
-                # Rotated tile coords
-                rtx = (rcx - 1) // 2
-                rty = (rcy - 1) // 2
-                
-                if (rtx, rty) not in region:
-                    is_symmetric = False
-                    break
-            
-            if is_symmetric:
-                if valid_dot is not None:
-                    # This theoretically shouldn't happen for distinct dots
-                    return False, "Region symmetric around multiple dots"
-                valid_dot = i
+        valid_dot = None
+        candidate = None
+        if sx % size == 0 and sy % size == 0:
+            candidate = dot_lookup.get((sx // size, sy // size))
+        if candidate is not None:
+            i, box_x, box_y, shift = candidate
+            # Once the bounding box maps onto itself no tile leaves the grid, so the
+            # rotated tile index is simply center - tile.
+            if min(xs) + max(xs) == box_x and min(ys) + max(ys) == box_y:
+                # With the region as a bitmask (bit t = tile t), tile -> center - tile is a
+                # bit reversal (t -> n - 1 - t) followed by a shift of n - 1 - center.
+                mask = sum(map((1).__lshift__, region))
+                reversed_mask = int(format(mask, mask_fmt)[::-1], 2)
+                rotated = reversed_mask >> shift if shift >= 0 else reversed_mask << -shift
+                if rotated == mask:
+                    valid_dot = i
         
         if valid_dot is None:
             return False, f"Region of size {len(region)} has no valid symmetry center (dot)"
         
         used_dots.append(valid_dot)
             
-    # Check if number of regions equals number of dots
-    if len(regions) != len(dots):
-        return False, f"Found {len(regions)} regions but {len(dots)} dots"
-        
     # Check if all dots are used exactly once
     if len(set(used_dots)) != len(dots):
         return False, "Not all dots are used or some dots used multiple times"
         
     return True, "Success"
 
+def decode_grid(raw):
+    # Only the part from the grid header on is decoded; any log before it is skipped
+    start = raw.find(GRID_HEADER.encode())
+    return raw[start:].decode('utf-8', errors='replace') if start != -1 else ""
+
 def check(output_text):
-    if "No solution found" in output_text:
-        return False, "No solution found"
+    # Accepts the solver output as text or as raw bytes
+    head = output_text[:NO_SOLUTION_SCAN]
+    if isinstance(output_text, bytes):
+        head = head.decode('utf-8', errors='ignore') # The cut may split a character
+        output_text = decode_grid(output_text)
+        
+    if NO_SOLUTION in head:
+        return False, NO_SOLUTION
         
     data, err = parse_output(output_text)
     if err:
@@ -168,11 +183,11 @@ def check(output_text):
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         # Read from file
-        with open(sys.argv[1], 'r') as f:
+        with open(sys.argv[1], 'rb') as f:
             content = f.read()
     else:
         # Read from stdin
-        content = sys.stdin.read()
+        content = sys.stdin.buffer.read()
         
     success, msg = check(content)
     if success:
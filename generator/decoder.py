@@ -5,6 +5,14 @@ Tentai Show Puzzle Decoder and Visualizer
 Decodes puzzle strings from simple_generator and displays them.
 """
 
+import re
+import string
+
+# A dot marker, or a run of skip letters
+_TOKEN_RE = re.compile(r'[MB]|[a-z]+')
+_SKIP_COUNT = {c: i + 1 for i, c in enumerate(string.ascii_lowercase)}
+
+
 def decode_puzzle(game_id):
     """
     Decode a game ID string into grid dimensions and dot positions.
@@ -23,25 +31,25 @@ def decode_puzzle(game_id):
     # Internal grid size (includes edges and vertices)
     sx, sy = 2*w+1, 2*h+1
     
-    # Decode positions
+    # Decode positions. Runs of skip letters and dot markers are split out by
+    # the regex in one C-level pass, so the loop only visits tokens.
     dots = []
     pos = 0
     
-    for char in data:
-        if char == 'M':
+    for token in _TOKEN_RE.findall(data):
+        if token == 'M':
             # Regular dot (white/hollow)
             x, y = pos % sx, pos // sx
             dots.append((x, y, False))
             pos += 1
-        elif char == 'B':
+        elif token == 'B':
             # Black dot (filled)
             x, y = pos % sx, pos // sx
             dots.append((x, y, True))
             pos += 1
-        elif 'a' <= char <= 'z':
-            # Skip empty spaces
-            skip_count = ord(char) - ord('a') + 1
-            pos += skip_count
+        else:
+            # Skip empty spaces ('a' skips 1, ..., 'z' skips 26)
+            pos += sum(map(_SKIP_COUNT.__getitem__, token))
     
     return w, h, dots
 
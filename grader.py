@@ -3,30 +3,37 @@ import os
 import sys
 import time
 import glob
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import check
 
 def run_test(executable, input_file, time_limit):
-    try:
+    # stdout goes straight to a temp file and comes back as raw bytes;
+    # check.check only decodes the grid part of it
+    with tempfile.TemporaryFile() as out:
         start_time = time.time()
-        result = subprocess.run(
-            [executable, input_file],
-            capture_output=True,
-            text=True,
-            timeout=time_limit
-        )
+        proc = subprocess.Popen([executable, input_file], stdout=out, stderr=subprocess.PIPE)
+        try:
+            _, stderr = proc.communicate(timeout=time_limit)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            return None, "Timeout", -1, time_limit
         end_time = time.time()
-        return result.stdout, result.stderr, result.returncode, end_time - start_time
-    except subprocess.TimeoutExpired:
-        return None, "Timeout", -1, time_limit
+        out.seek(0)
+        return out.read(), stderr.decode(errors='replace'), proc.returncode, end_time - start_time
 
 def main():
     if len(sys.argv) < 4:
-        print("Usage: python3 grader.py <executable> <input_dir> <time_limit>")
+        print("Usage: python3 grader.py <executable> <input_dir> <time_limit> [jobs]")
         sys.exit(1)
 
     executable = sys.argv[1]
     input_dir = sys.argv[2]
     time_limit = float(sys.argv[3])
+    # Tests run one at a time by default so the reported times are not skewed
+    # by solvers competing for cores; pass jobs > 1 to run them concurrently.
+    jobs = int(sys.argv[4]) if len(sys.argv) > 4 else 1
 
     if not os.path.exists(executable):
         print(f"Error: Executable {executable} not found")
@@ -42,7 +49,7 @@ def main():
         print(f"No .in files found in {input_dir}")
         sys.exit(0)
         
-    print(f"Running {executable} on {len(input_files)} files in {input_dir} with {time_limit}s limit")
+    print(f"Running {executable} on {len(input_files)} files in {input_dir} with {time_limit}s limit ({jobs} jobs)")
     print("-" * 60)
     print(f"{'File':<20} | {'Status':<10} | {'Time':<8} | {'Message'}")
     print("-" * 60)
@@ -51,34 +58,35 @@ def main():
     total = 0
     durations = []
     
-    for input_file in input_files:
-        total += 1
-        filename = os.path.basename(input_file)
+    with ThreadPoolExecutor(max_workers=jobs) as ex:
+        # map() yields in input order while later tests keep running
+        results = ex.map(lambda f: run_test(executable, f, time_limit), input_files)
+        for input_file, (stdout, stderr, ret, duration) in zip(input_files, results):
+            total += 1
+            filename = os.path.basename(input_file)
+            
+            status = ""
+            message = ""
         
-        stdout, stderr, ret, duration = run_test(executable, input_file, time_limit)
-        
-        status = ""
-        message = ""
-        
-        if ret == -1:
-            status = "TIMEOUT"
-            message = f"> {time_limit}s"
-        elif ret != 0:
-            status = "CRASH"
-            message = f"Return code {ret}"
-        else:
-            # Verify output
-            success, msg = check.check(stdout)
-            if success:
-                status = "PASS"
-                passed += 1
+            if ret == -1:
+                status = "TIMEOUT"
+                message = f"> {time_limit}s"
+            elif ret != 0:
+                status = "CRASH"
+                message = f"Return code {ret}"
             else:
-                status = "FAIL"
-                print(f"{filename} output:\n{stdout}\n")
-                message = msg
+                # Verify output
+                success, msg = check.check(stdout)
+                if success:
+                    status = "PASS"
+                    passed += 1
+                else:
+                    status = "FAIL"
+                    print(f"{filename} output:\n{stdout.decode(errors='replace')}\n")
+                    message = msg
                 
-        print(f"{filename:<20} | {status:<10} | {duration:.4f}s | {message}")
-        durations.append(duration)
+            print(f"{filename:<20} | {status:<10} | {duration:.4f}s | {message}")
+            durations.append(duration)
         
     print("-" * 60)
     print(f"Summary: {passed}/{total} passed, Average Time: {sum(durations)/total:.4f}s")